@@ -0,0 +1,111 @@
+# auth.py
+import streamlit as st
+import bcrypt
+import json
+import os
+
+
+# --- Configuration Setup ---
+
+# Create config directory if it doesn't exist (once per process, not on every rerun)
+@st.cache_resource(show_spinner=False)
+def ensure_config_dir(path):
+    os.makedirs(path, exist_ok=True)
+
+@st.cache_data(show_spinner=False)
+def load_config(path, mtime_ns):
+    """Parses config.json once per file version; mtime_ns only keys the cache."""
+    with open(path) as file:
+        return json.load(file)
+
+def create_config(config_path):
+    """Builds the config from secrets (secrets hold the plain password locally) and saves it."""
+    # Read credentials from Streamlit secrets (keep secrets.toml local and ignored by git)
+    try:
+        auth = st.secrets["auth"]
+        admin_username, admin_email, admin_password = auth["username"], auth["email"], auth["password"]
+    except Exception as e:
+        st.error("Missing auth secrets. Create .streamlit/secrets.toml with [auth] username, email, password.")
+        st.stop()
+
+    # Build credentials with PLAIN password first
+    credentials = {
+        "usernames": {
+            admin_username: {
+                "name": "Admin User",
+                "email": admin_email,
+                "password": admin_password  # ← Plain text here (safe, since it's local/secrets only)
+            }
+        }
+    }
+
+    # NOW hash the password in-place. Every login pays 2**rounds bcrypt iterations, so the cost
+    # is configurable via [auth] bcrypt_rounds; 10 keeps logins quick and stays above OWASP's floor.
+    rounds = int(auth.get("bcrypt_rounds", 10))
+    user = credentials["usernames"][admin_username]
+    user["password"] = bcrypt.hashpw(user["password"].encode(), bcrypt.gensalt(rounds=rounds)).decode()
+
+    default_config = {
+        "credentials": credentials,  # ← Now contains the HASHED password
+        "cookie": {
+            "expiry_days": 1,
+            "key": "household_dashboard_auth_key",  # you can change this to any random string
+            "name": "household_dashboard_cookie"
+        },
+        "preauthorized": {
+            "emails": [admin_email]
+        }
+    }
+
+    # Save hashed credentials to config.json (this file contains only hashed password)
+    with open(config_path, "w") as fh:
+        json.dump(default_config, fh, indent=2)
+
+    # Use the dict we just wrote instead of reading the file straight back
+    return default_config
+
+# Initialize authenticator
+def build_authenticator(config_path):
+    """Returns this session's authenticator, rebuilding it only until login succeeds."""
+    # Kept in session_state, not st.cache_resource: the cookie manager inside holds one
+    # browser's cookies. It must be rebuilt while logged out so it can report the re-auth cookie.
+    if not st.session_state.get("authentication_status") or "authenticator" not in st.session_state:
+        ensure_config_dir(str(config_path.parent))
+        # If config doesn't exist, create it; otherwise load it (the file contains hashed password)
+        if not config_path.exists():
+            config = create_config(config_path)
+        else:
+            config = load_config(str(config_path), config_path.stat().st_mtime_ns)
+
+        # Imported here rather than at module top: it pulls in JWT and the cookie-manager
+        # component, which the first page render does not need
+        import streamlit_authenticator as stauth
+        st.session_state["authenticator"] = stauth.Authenticate(
+            credentials=config["credentials"],
+            cookie_name=config["cookie"]["name"],
+            cookie_key=config["cookie"]["key"],
+            cookie_expiry_days=config["cookie"]["expiry_days"]
+        )
+    return st.session_state["authenticator"]
+
+# --- Login using Session State ---
+
+def show_login(authenticator):
+    """Handles the login form display and state update via session_state."""
+    st.markdown("<h1 style='text-align:center;'>🔐 Household Survey Dashboard</h1>", unsafe_allow_html=True)
+
+    # Already logged in this session: skip the login widget and its cookie check
+    if st.session_state.get("authentication_status") is True:
+        return
+
+    # Call the login function. This displays the form and updates st.session_state
+    # with keys: 'authentication_status', 'name', and 'username'.
+    authenticator.login(location="main")
+
+    # Check the status written to session_state
+    if st.session_state["authentication_status"] is False:
+        st.error("Username/password is incorrect")
+    elif st.session_state["authentication_status"] is None:
+        st.warning("Please enter your username and password")
+
+    # Note: We don't return anything here. The main function will check st.session_state directly.
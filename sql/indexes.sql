@@ -0,0 +1,23 @@
+-- Indexes backing the dashboard's per-site queries (dashboard.py).
+-- Safe to re-run; apply with: psql "$SUPABASE_URL" -f sql/indexes.sql
+
+-- load_site_data() and load_site_gps() filter households by LOWER(pro_name)
+CREATE INDEX IF NOT EXISTS idx_households_lower_pro_name ON households (LOWER(pro_name));
+
+-- Individuals are joined to their household by parent_key
+CREATE INDEX IF NOT EXISTS idx_individuals_parent_key ON individuals (parent_key);
+
+-- The Data Quality and Report queries match pro_name exactly (load_daily_tally() and friends).
+-- DATE(interview_date_time_1) casts text, which is not immutable, so it cannot join this index.
+CREATE INDEX IF NOT EXISTS idx_households_pro_name ON households (pro_name);
+
+-- Form 1B groups each site's interviews by month on the text prefix LEFT(interview_date_time_1, 7).
+-- LEFT() is immutable, unlike TO_DATE() or a ::date cast, so it can be indexed.
+CREATE INDEX IF NOT EXISTS idx_households_pro_name_interview_month
+    ON households (pro_name, LEFT(interview_date_time_1, 7));
+
+-- load_mortality() and load_outcomes() read only these columns of a site's households, grouped by
+-- sector; covering them lets the planner answer from the index without visiting the heap.
+CREATE INDEX IF NOT EXISTS idx_households_pro_name_sector
+    ON households (pro_name, sector)
+    INCLUDE (key, four_1_1, consent_three_7_1, consent_death_three_7_2);